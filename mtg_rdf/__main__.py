@@ -8,6 +8,8 @@ def main():
     parser.add_argument('--ingest', action='store_true', help='run the ingest process')
     parser.add_argument('--extract', action='store_true', help='run the extract process')
     parser.add_argument('--transform', action='store_true', help='run the transform process')
+    parser.add_argument('--ntriples', action='store_true', help='stream N-Triples without building an in-memory graph (with --transform)')
+    parser.add_argument('--turtle', action='store_true', help='also convert the N-Triples output to Turtle with rapper (with --transform)')
 
     args = parser.parse_args()
 
@@ -23,7 +25,12 @@ def main():
     if args.transform:
         print("Running transform...")
         t = Transformer()
-        t.transform()
+        if args.ntriples:
+            t.transform_streaming()
+        else:
+            t.transform()
+        if args.turtle:
+            t.to_turtle()
 
     if not (args.ingest or args.extract or args.transform):
         parser.print_help()
@@ -5,8 +5,10 @@ from pathlib import Path
 META_URL = "https://mtgjson.com/api/v5/Meta.json"
 ALL_PRINTINGS_URL = "https://mtgjson.com/api/v5/AllPrintings.json"
 DATA_DIR = Path(__file__).parent.parent / "data"
-RDF_FILEPATH = Path(f"{DATA_DIR}/mtg-rdf.ttl")
+RDF_FILEPATH = Path(f"{DATA_DIR}/mtg-rdf.nt")
+TURTLE_FILEPATH = Path(f"{DATA_DIR}/mtg-rdf.ttl")
 META_FILEPATH = Path(f"{DATA_DIR}/Meta.json")
+META_VALIDATORS_FILEPATH = Path(f"{DATA_DIR}/Meta.validators.json")
 ALL_PRINTINGS_FILEPATH = Path(f"{DATA_DIR}/AllPrintings.json")
 
 
@@ -1,11 +1,15 @@
+import shutil
 import requests
 from . import config
-from .config import META_URL, ALL_PRINTINGS_URL, DATA_DIR, RDF_FILEPATH, META_FILEPATH, ALL_PRINTINGS_FILEPATH
-import json
+from .config import META_URL, ALL_PRINTINGS_URL, DATA_DIR, RDF_FILEPATH, META_FILEPATH, META_VALIDATORS_FILEPATH, ALL_PRINTINGS_FILEPATH
+import orjson
 
 
 config.initialize()
 
+# Response headers that let the server answer 304 Not Modified next time
+VALIDATOR_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
 class Extractor():
     """Extractor class for fetching MTG JSON data."""
 
@@ -13,12 +17,34 @@ class Extractor():
         self.meta_url = META_URL
         self.all_printings_url = ALL_PRINTINGS_URL
         self.data_dir = DATA_DIR
-
-    def __fetch_data(self, url):
-        """Fetch JSON data from a given URL."""
-        response = requests.get(url)
+        self.meta_validators = {}
+
+    def __fetch_meta(self, conditional=False):
+        """Fetch Meta.json, or return None if it is unchanged since the last download."""
+        headers = {}
+        if conditional and META_VALIDATORS_FILEPATH.exists():
+            with open(META_VALIDATORS_FILEPATH, 'rb') as f:
+                validators = orjson.loads(f.read())
+            headers = {VALIDATOR_HEADERS[name]: value for name, value in validators.items()}
+
+        response = requests.get(self.meta_url, headers=headers)
+        if response.status_code == requests.codes.not_modified:
+            return None
         response.raise_for_status()
-        return response.json()
+        self.meta_validators = {
+            name: response.headers[name] for name in VALIDATOR_HEADERS if name in response.headers
+        }
+        return orjson.loads(response.content)
+
+    def __download_to(self, url, path):
+        """Stream the response body for a given URL straight to a file."""
+        partial_path = path.with_name(path.name + ".part")
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(partial_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+        partial_path.replace(path)
 
     def extract(self):
         """Extract MTG JSON data."""
@@ -28,25 +54,30 @@ class Extractor():
         if not RDF_FILEPATH.exists() or not META_FILEPATH.exists():
             extraction_required = True
 
+        fetched_meta_data = None
         if META_FILEPATH.exists():
-            with open(META_FILEPATH, 'r', encoding='utf-8') as f:
-                local_meta_data = json.load(f)
-            meta_data = self.__fetch_data(self.meta_url)
-            data_date = meta_data['data']['date']
-            if local_meta_data['data']['date'] != data_date:
+            with open(META_FILEPATH, 'rb') as f:
+                local_meta_data = orjson.loads(f.read())
+            fetched_meta_data = self.__fetch_meta(conditional=True)
+            if fetched_meta_data is None:
+                print("Meta data not modified.")
+            elif local_meta_data['data']['date'] != fetched_meta_data['data']['date']:
                 extraction_required = True
 
         if extraction_required:
             print("Extraction required. Fetching data...")
-            meta_data = self.__fetch_data(self.meta_url)
-            with open(META_FILEPATH, 'w', encoding='utf-8') as f:
-                json.dump(meta_data, f, ensure_ascii=False, indent=4)
-            print("Meta data updated.")
+            meta_data = fetched_meta_data or self.__fetch_meta()
 
             print("Downloading...")
-            all_printings = self.__fetch_data(self.all_printings_url)
-            with open(ALL_PRINTINGS_FILEPATH, 'w', encoding='utf-8') as f:
-                json.dump(all_printings, f, ensure_ascii=False, indent=4)
+            self.__download_to(self.all_printings_url, ALL_PRINTINGS_FILEPATH)
+
+            # Only record the new build once AllPrintings.json is on disk, so an
+            # interrupted download is retried on the next run
+            with open(META_FILEPATH, 'wb') as f:
+                f.write(orjson.dumps(meta_data, option=orjson.OPT_INDENT_2))
+            with open(META_VALIDATORS_FILEPATH, 'wb') as f:
+                f.write(orjson.dumps(self.meta_validators))
+            print("Meta data updated.")
             print("Done!")
 
 if __name__ == "__main__":
@@ -1,29 +1,30 @@
 import docker
 
 ALLOWD_DBS=['graphdb']
+REQUIRED_CONTAINER_KEYS = {"image", "name", "ports", "environment"}
 
 class Loader:
 
-    def __init__(self, db, container_config = {}):
+    def __init__(self, db, container_config):
         if db not in ALLOWD_DBS:
             raise ValueError(f"Database '{db}' is not supported. Supported databases are: {', '.join(ALLOWD_DBS)}")
         else:
             self.db = db
+        missing_keys = REQUIRED_CONTAINER_KEYS - container_config.keys()
+        if missing_keys:
+            raise ValueError(f"Container config is missing required keys: {', '.join(sorted(missing_keys))}")
         self.client = docker.from_env()
         self.container_config = container_config
 
-    def run_container(self, image, name, ports, environment):
-        try:
-            container = self.client.containers.run(
-                image=self.container_config["image"],
-                name=self.container_config["name"],
-                ports=self.container_config["ports"],
-                environment=self.container_config["environment"],
-                detach=True
-            )
-            print(f"Container '{name}' started successfully.")
-            return container
-        except Exception as e:
-            print(f"Error starting container '{name}': {e}")
-            return None
+    def run_container(self):
+        """Start the configured container; docker.errors.APIError propagates to the caller."""
+        container = self.client.containers.run(
+            image=self.container_config["image"],
+            name=self.container_config["name"],
+            ports=self.container_config["ports"],
+            environment=self.container_config["environment"],
+            detach=True
+        )
+        print(f"Container '{self.container_config['name']}' started successfully.")
+        return container
 
@@ -1,150 +1,274 @@
 """Transformer class for converting MTG JSON data to RDF."""
 
-from .config import ALL_PRINTINGS_FILEPATH, RDF_FILEPATH
-import json
+import os
+import shutil
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from .config import ALL_PRINTINGS_FILEPATH, RDF_FILEPATH, TURTLE_FILEPATH
+import ijson
 from rdflib import Graph, Namespace, Literal, URIRef, RDF, XSD
 from tqdm import tqdm
 
 
 # Define MTG ontology namespace
 MTGO = Namespace("https://cmdoret.net/mtg_ontology/")
+_CARD_NS = MTGO + "card/"
+_CARD_NS_B = _CARD_NS.encode("utf-8")
+
+# Valid card type classes defined in the MTG ontology
+VALID_TYPES = frozenset(
+    {
+        "Artifact",
+        "Creature",
+        "Enchantment",
+        "Instant",
+        "Land",
+        "Sorcery",
+    }
+)
+_TYPE_URIS = {card_type: MTGO[card_type] for card_type in VALID_TYPES}
+
+# Single-valued card fields: (JSON key, predicate, literal datatype, cached).
+# Only fields whose values repeat across many cards are cached; caching
+# near-unique values such as uuid or oracle text only churns the cache.
+_SCALAR_FIELDS = (
+    # Basic card info
+    ("name", MTGO.name, None, False),
+    ("artist", MTGO.artist, None, True),
+    ("uuid", MTGO.id, None, False),
+    # Card types
+    ("type", MTGO.card_type, None, True),
+    # Rarity
+    ("rarity", MTGO.rarity, None, True),
+    # Mana cost and CMC
+    ("manaCost", MTGO.mana_cost, None, True),
+    ("manaValue", MTGO.converted_mana_cost, XSD.decimal, True),
+    # Oracle text and rules text
+    ("text", MTGO.oracle_text, None, False),
+    ("originalText", MTGO.rules_text, None, False),
+    # Power/Toughness for creatures
+    ("power", MTGO.power, None, True),
+    ("toughness", MTGO.toughness, None, True),
+    # Loyalty for planeswalkers
+    ("loyalty", MTGO.loyalty, None, True),
+    # Set information
+    ("setCode", MTGO.set_code, None, True),
+    ("number", MTGO.collector_number, None, False),
+)
+
+# Multi-valued card fields: (JSON key, predicate), one triple per element.
+# Their values (colors, subtypes, keywords, ...) always repeat, so they are cached.
+_LIST_FIELDS = (
+    ("subtypes", MTGO.card_subtype),
+    ("supertypes", MTGO.card_supertype),
+    ("colors", MTGO.color),
+    ("colorIdentity", MTGO.color_identity),
+    ("keywords", MTGO.ability_keyword),
+)
+
+# Terms emitted for every card outside the field tables
+_RDF_TYPE = RDF.type
+_CARD_CLASS = MTGO.Card
+_CARD_SET = MTGO.card_set
+# Types without an ontology class are kept as card_type literals instead
+_CARD_TYPE = MTGO.card_type
+
+# Escapes required inside an N-Triples string literal
+_NT_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"})
+
+
+def _nt_uri(uri):
+    """Format a URI as an N-Triples IRI term."""
+    return f"<{uri}>".encode("utf-8")
+
+
+def _escape_literal(value):
+    """Format a value as the quoted lexical form of an N-Triples literal."""
+    return b'"' + str(value).translate(_NT_ESCAPES).encode("utf-8") + b'"'
+
+
+# Cached variant of _escape_literal for values that repeat across many cards
+_escape_repeated = lru_cache(maxsize=4096, typed=True)(_escape_literal)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _lit(value, datatype=None):
+    """Return a shared Literal for values that repeat across many cards."""
+    return Literal(value, datatype=datatype)
+
+
+# Pre-formatted N-Triples terms mirroring the field tables above
+_NT_RDF_TYPE = _nt_uri(_RDF_TYPE)
+_NT_CARD_CLASS = _nt_uri(_CARD_CLASS)
+_NT_CARD_SET = _nt_uri(_CARD_SET)
+_NT_CARD_TYPE = _nt_uri(_CARD_TYPE)
+_NT_TYPE_URIS = {card_type: _nt_uri(uri) for card_type, uri in _TYPE_URIS.items()}
+_NT_SCALAR_FIELDS = tuple(
+    (
+        key,
+        _nt_uri(predicate),
+        b"^^" + _nt_uri(datatype) if datatype else b"",
+        _escape_repeated if cached else _escape_literal,
+    )
+    for key, predicate, datatype, cached in _SCALAR_FIELDS
+)
+_NT_LIST_FIELDS = tuple((key, _nt_uri(predicate)) for key, predicate in _LIST_FIELDS)
+
+
+def card_to_ntriples(card_info, set_name):
+    """Format the triples for a single card as N-Triples bytes."""
+    subject = b"<" + _CARD_NS_B + card_info["uuid"].encode("ascii") + b"> "
+    parts = [subject, _NT_RDF_TYPE, b" ", _NT_CARD_CLASS, b" .\n"]
+
+    for card_type in card_info.get("types", ()):
+        type_class = _NT_TYPE_URIS.get(card_type)
+        if type_class is not None:
+            parts += (subject, _NT_RDF_TYPE, b" ", type_class, b" .\n")
+        else:
+            parts += (subject, _NT_CARD_TYPE, b" ", _escape_repeated(card_type), b" .\n")
+
+    for key, predicate, datatype, escape in _NT_SCALAR_FIELDS:
+        value = card_info.get(key)
+        if value is not None:
+            parts += (subject, predicate, b" ", escape(value), datatype, b" .\n")
+
+    for key, predicate in _NT_LIST_FIELDS:
+        for value in card_info.get(key, ()):
+            parts += (subject, predicate, b" ", _escape_repeated(value), b" .\n")
+
+    if set_name:
+        parts += (subject, _NT_CARD_SET, b" ", _escape_repeated(set_name), b" .\n")
+
+    return b"".join(parts)
+
+
+def set_to_shard(set_name, set_info, shard_path):
+    """Write the N-Triples for every card in a set to shard_path."""
+    with open(shard_path, "wb") as f:
+        for card_info in set_info["cards"]:
+            f.write(card_to_ntriples(card_info, set_name))
+    return shard_path
+
+
+def _append_shard(shard_path, f):
+    """Copy a finished shard onto the end of f and delete it."""
+    with open(shard_path, "rb") as shard:
+        shutil.copyfileobj(shard, f)
+    os.remove(shard_path)
+
+
+def _compile_card_quads():
+    """Generate card_quads with the field tables unrolled into straight-line code.
+
+    The card schema is fixed, so the per-field loops and table lookups are
+    resolved once at import time instead of for every card.
+    """
+    namespace = {
+        "URIRef": URIRef,
+        "Literal": Literal,
+        "_lit": _lit,
+        "_CARD_NS": _CARD_NS,
+        "_TYPE_URIS": _TYPE_URIS,
+        "_RDF_TYPE": _RDF_TYPE,
+        "_CARD_CLASS": _CARD_CLASS,
+        "_CARD_SET": _CARD_SET,
+        "_CARD_TYPE": _CARD_TYPE,
+    }
+    lines = [
+        "def card_quads(self, card_info, set_name, quads):",
+        '    """Append the quads for a single card to quads."""',
+        '    card_uri = URIRef(_CARD_NS + card_info["uuid"])',
+        "    graph = self.graph",
+        "    append = quads.append",
+        "    get = card_info.get",
+        # Always add base Card type (explicit is better than implicit)
+        "    append((card_uri, _RDF_TYPE, _CARD_CLASS, graph))",
+        # Also add specific type classes that exist in the ontology,
+        # falling back to a card_type literal for the other types
+        '    for card_type in get("types", ()):',
+        "        type_class = _TYPE_URIS.get(card_type)",
+        "        if type_class is not None:",
+        "            append((card_uri, _RDF_TYPE, type_class, graph))",
+        "        else:",
+        "            append((card_uri, _CARD_TYPE, _lit(card_type), graph))",
+    ]
+    for index, (key, predicate, datatype, cached) in enumerate(_SCALAR_FIELDS):
+        namespace[f"_S{index}"] = predicate
+        factory = "_lit" if cached else "Literal"
+        literal = f"{factory}(value)"
+        if datatype is not None:
+            namespace[f"_D{index}"] = datatype
+            literal = f"{factory}(value, datatype=_D{index})"
+        lines += [
+            f"    value = get({key!r})",
+            "    if value is not None:",
+            f"        append((card_uri, _S{index}, {literal}, graph))",
+        ]
+    for index, (key, predicate) in enumerate(_LIST_FIELDS):
+        namespace[f"_L{index}"] = predicate
+        lines += [
+            f"    for value in get({key!r}, ()):",
+            f"        append((card_uri, _L{index}, _lit(value), graph))",
+        ]
+    lines += [
+        "    if set_name:",
+        "        append((card_uri, _CARD_SET, _lit(set_name), graph))",
+    ]
+    exec("\n".join(lines), namespace)
+    return namespace["card_quads"]
 
 
 class Transformer:
     def __init__(self):
-        self.graph = Graph()
+        self.graph = Graph(store="Oxigraph", bind_namespaces="none")
         self.graph.bind("mtgo", MTGO)
-        self._data = None
-
-    @property
-    def data(self):
-        """Lazy load the JSON data on first access."""
-        if self._data is None:
-            with open(ALL_PRINTINGS_FILEPATH, "r", encoding="utf-8") as f:
-                self._data = json.load(f)
-        return self._data
 
-    def add_card(self, card_info, set_name):
-        card_uri = URIRef(MTGO + f"card/{card_info['uuid']}")
-
-        # Valid card type classes defined in the MTG ontology
-        VALID_TYPES = {
-            "Artifact",
-            "Creature",
-            "Enchantment",
-            "Instant",
-            "Land",
-            "Sorcery",
-        }
-
-        # Always add base Card type (explicit is better than implicit)
-        self.graph.add((card_uri, RDF.type, MTGO.Card))
-
-        # Also add specific type classes (Land, Creature, Artifact, etc.)
-        if "types" in card_info:
-            for card_type in card_info["types"]:
-                # Only add if it's a valid ontology class
-                if card_type in VALID_TYPES:
-                    type_class = MTGO[card_type]
-                    self.graph.add((card_uri, RDF.type, type_class))
-
-        # Basic card info
-        if "name" in card_info:
-            self.graph.add((card_uri, MTGO.name, Literal(card_info["name"])))
-
-        if "artist" in card_info:
-            self.graph.add((card_uri, MTGO.artist, Literal(card_info["artist"])))
-
-        if "uuid" in card_info:
-            self.graph.add((card_uri, MTGO.id, Literal(card_info["uuid"])))
-
-        # Card types
-        if "type" in card_info:
-            self.graph.add((card_uri, MTGO.card_type, Literal(card_info["type"])))
-
-        if "types" in card_info:
-            for card_type in card_info["types"]:
-                self.graph.add((card_uri, MTGO.card_type, Literal(card_type)))
-
-        if "subtypes" in card_info:
-            for subtype in card_info["subtypes"]:
-                self.graph.add((card_uri, MTGO.card_subtype, Literal(subtype)))
-
-        if "supertypes" in card_info:
-            for supertype in card_info["supertypes"]:
-                self.graph.add((card_uri, MTGO.card_supertype, Literal(supertype)))
-
-        # Colors
-        if "colors" in card_info:
-            for color in card_info["colors"]:
-                self.graph.add((card_uri, MTGO.color, Literal(color)))
-
-        if "colorIdentity" in card_info:
-            for color in card_info["colorIdentity"]:
-                self.graph.add((card_uri, MTGO.color_identity, Literal(color)))
-
-        # Rarity
-        if "rarity" in card_info:
-            self.graph.add((card_uri, MTGO.rarity, Literal(card_info["rarity"])))
-
-        # Mana cost and CMC
-        if "manaCost" in card_info:
-            self.graph.add((card_uri, MTGO.mana_cost, Literal(card_info["manaCost"])))
-
-        if "manaValue" in card_info:
-            self.graph.add(
-                (
-                    card_uri,
-                    MTGO.converted_mana_cost,
-                    Literal(card_info["manaValue"], datatype=XSD.decimal),
-                )
-            )
-
-        # Oracle text and rules text
-        if "text" in card_info:
-            self.graph.add((card_uri, MTGO.oracle_text, Literal(card_info["text"])))
-
-        if "originalText" in card_info:
-            self.graph.add(
-                (card_uri, MTGO.rules_text, Literal(card_info["originalText"]))
-            )
+    def iter_sets(self):
+        """Stream (set_name, set_info) pairs from the JSON data one set at a time."""
+        with open(ALL_PRINTINGS_FILEPATH, "rb") as f:
+            for set_name, set_info in ijson.kvitems(f, "data", use_float=True):
+                yield set_name, set_info
 
-        # Power/Toughness for creatures
-        if "power" in card_info:
-            self.graph.add((card_uri, MTGO.power, Literal(card_info["power"])))
+    card_quads = _compile_card_quads()
 
-        if "toughness" in card_info:
-            self.graph.add((card_uri, MTGO.toughness, Literal(card_info["toughness"])))
-
-        # Loyalty for planeswalkers
-        if "loyalty" in card_info:
-            self.graph.add((card_uri, MTGO.loyalty, Literal(card_info["loyalty"])))
-
-        # Keywords
-        if "keywords" in card_info:
-            for keyword in card_info["keywords"]:
-                self.graph.add((card_uri, MTGO.ability_keyword, Literal(keyword)))
-
-        # Set information
-        if "setCode" in card_info:
-            self.graph.add((card_uri, MTGO.set_code, Literal(card_info["setCode"])))
-
-        if set_name:
-            self.graph.add((card_uri, MTGO.card_set, Literal(set_name)))
+    def add_card(self, card_info, set_name):
+        quads = []
+        self.card_quads(card_info, set_name, quads)
+        self.graph.addN(quads)
+
+    def add_set(self, set_name, set_info):
+        """Add every card in a set to the graph in a single batch."""
+        quads = []
+        for card_info in set_info["cards"]:
+            self.card_quads(card_info, set_name, quads)
+        self.graph.addN(quads)
+
+    def serialize(self, format="ox-ntriples", destination=RDF_FILEPATH):
+        self.graph.serialize(destination=destination, format=format)
 
-        if "number" in card_info:
-            self.graph.add(
-                (card_uri, MTGO.collector_number, Literal(card_info["number"]))
+    def to_turtle(self, source=RDF_FILEPATH, destination=TURTLE_FILEPATH):
+        """Convert N-Triples output to Turtle with raptor's rapper, if installed."""
+        if shutil.which("rapper") is None:
+            print("rapper not found, skipping Turtle conversion.")
+            return False
+        with open(destination, "wb") as f:
+            subprocess.run(
+                ["rapper", "-q", "-i", "ntriples", "-o", "turtle", str(source)],
+                stdout=f,
+                check=True,
             )
-
-    def serialize(self, format="turtle", destination=RDF_FILEPATH):
-        self.graph.serialize(destination=destination, format=format)
+        print(f"Turtle written to {destination}.")
+        return True
 
     def transform(self):
         print("Converting to RDF...")
-        for set_name, set_info in tqdm(self.data["data"].items()):
-            for card_info in set_info["cards"]:
-                self.add_card(card_info, set_name)
+        for set_name, set_info in tqdm(self.iter_sets(), mininterval=0.5, unit="set"):
+            self.add_set(set_name, set_info)
 
         print("Conversion completed.")
 
@@ -152,6 +276,38 @@ class Transformer:
         self.serialize()
         print("RDF data serialized successfully.")
 
+    def transform_streaming(self, out_path=RDF_FILEPATH):
+        """Write N-Triples straight to out_path, bypassing the in-memory graph.
+
+        With more than one CPU, sets are converted in parallel worker processes,
+        each writing its own shard. At most 2 x workers sets are in flight at a
+        time, and shards are appended to out_path in input order.
+        """
+        print("Converting to N-Triples...")
+        workers = os.cpu_count() or 1
+        sets = tqdm(self.iter_sets(), mininterval=0.5, unit="set")
+        with open(out_path, "wb") as f:
+            if workers == 1:
+                for set_name, set_info in sets:
+                    for card_info in set_info["cards"]:
+                        f.write(card_to_ntriples(card_info, set_name))
+            else:
+                with (
+                    tempfile.TemporaryDirectory() as tmpdir,
+                    ProcessPoolExecutor(max_workers=workers) as executor,
+                ):
+                    pending = deque()
+                    for index, (set_name, set_info) in enumerate(sets):
+                        if len(pending) >= 2 * workers:
+                            _append_shard(pending.popleft().result(), f)
+                        shard_path = Path(tmpdir) / f"{index:05d}.nt"
+                        pending.append(
+                            executor.submit(set_to_shard, set_name, set_info, shard_path)
+                        )
+                    while pending:
+                        _append_shard(pending.popleft().result(), f)
+
+        print(f"N-Triples written to {out_path}.")
 
 if __name__ == "__main__":
     foo = Transformer()